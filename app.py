@@ -1,5 +1,6 @@
+import datetime
 from decimal import Decimal
-import locale
+import functools
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal, VerticalScroll
 from textual.widgets import Header, Footer, Static, DataTable, TabbedContent, TabPane, Label
@@ -7,21 +8,30 @@ from textual.binding import Binding
 
 import domain
 
-# Tentar configurar locale para pt_BR, fallback para padrao se nao disponivel
-try:
-    locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'pt_BR')
-    except locale.Error:
-        pass  # Mantem locale padrao do sistema
-
-def format_currency(value: Decimal) -> str:
-    # Fallback manual format se locale nao ajudar
-    try:
-        return locale.currency(value, grouping=True)
-    except (ValueError, TypeError):
-        return f"R$ {value:,.2f}"
+# Abreviacoes pt_BR fixas: saida independe do locale do sistema
+_MES_ABBR = ("jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez")
+
+_CENTAVO = Decimal("0.01")
+_SEPARADORES_PT_BR = str.maketrans(",.", ".,")
+
+@functools.lru_cache(maxsize=512)
+def _format_centavos(value: Decimal) -> str:
+    # Formato pt_BR fixo (R$ 1.234,56) sem depender do LC_MONETARY do sistema
+    sinal = "-" if value < 0 else ""
+    numero = f"{abs(value):,.2f}".translate(_SEPARADORES_PT_BR)
+    return f"{sinal}R$ {numero}"
+
+def format_currency(value: Decimal | float) -> str:
+    # Quantizar antes do cache: valores que diferem so apos o centavo compartilham a entrada
+    return _format_centavos(Decimal(value).quantize(_CENTAVO))
+
+# Entradas da projecao: dados carregados + mes corrente
+_ChaveDados = tuple[
+    domain.Configuracao,
+    tuple[domain.GastoFixo, ...],
+    tuple[domain.Parcelamento, ...],
+    datetime.date,
+]
 
 class KPICard(Static):
     """Um widget para mostrar um valor chave."""
@@ -85,15 +95,30 @@ class TuiFinanceira(App[None]):
 
     data: domain.OrcamentoData
     projecao: list[domain.MesProjecao]
+    _last_data_key: _ChaveDados | None = None
 
     def on_mount(self) -> None:
         self.action_reload_data()
 
     def action_reload_data(self) -> None:
         try:
-            self.data = domain.load_data()
+            data = domain.load_data()
+            # A projecao depende dos dados e do mes corrente; sem mudanca, nada a recalcular.
+            # Compara a chave com ==: hashes iguais nao garantem dados iguais
+            data_key: _ChaveDados = (
+                data.configuracao,
+                tuple(data.gastos_fixos),
+                tuple(data.parcelamentos),
+                datetime.date.today().replace(day=1),
+            )
+            if data_key == self._last_data_key:
+                self.notify("Sem alterações")
+                return
+
+            self.data = data
             self.projecao = domain.gerar_projecao(self.data)
             self.update_dashboard()
+            self._last_data_key = data_key
             self.notify("Dados recarregados com sucesso!")
         except Exception as e:
             self.notify(f"Erro ao carregar dados: {e}", severity="error")
@@ -125,63 +150,68 @@ class TuiFinanceira(App[None]):
         if not self.projecao:
             return
 
-        # 1. Update KPIs (Mes Atual - indice 0)
-        atual = self.projecao[0]
-
-        self.query_one("#kpi-receita", KPICard).update_value(format_currency(atual.salario_liquido))
-        self.query_one("#kpi-gastos", KPICard).update_value(format_currency(atual.gastos_totais))
-        self.query_one("#kpi-meta", KPICard).update_value(format_currency(atual.meta_investimento))
-        self.query_one("#kpi-saldo", KPICard).update_value(format_currency(atual.saldo_livre))
-
-        # 2. Update Table
-        table = self.query_one(DataTable)
-        table.clear(columns=True)
-        table.add_columns(
-            "Mês",
-            "Dias Úteis",
-            "DSR",
-            "Receita Líq.",
-            "Gastos Totais",
-            "Saldo Livre",
-            "Parcelas Ativas"
-        )
-
-        # Track previous installments to highlight changes
-        for i, mes in enumerate(self.projecao):
-            mes_str = mes.data.strftime("%b/%Y")
-            curr_parcelas_count = len(mes.detalhes_parcelas)
-
-            # Formatar lista de parcelas
-            parcelas_str = ", ".join(mes.detalhes_parcelas) if mes.detalhes_parcelas else "-"
-
-            # Simple highlight logic: if parcelas count dropped, maybe highlight the row or cell?
-            # Textual DataTable supports styling rows/cells?
-            # We can use rich text or just logic.
-
-            # Let's verify if a installment ended compared to previous month
-            # (In this logic, we iterate forward. If previous month had more installments,
-            # this month represents a "relief".)
-
-            # Note: The logic in prompt says "Visual highlight when an installment ends (saldo livre increases)".
-            # A simple way is to check if saldo livre jumped significantly or parcel count dropped.
-
-            styled_saldo = format_currency(mes.saldo_livre)
-            if i > 0:
-                prev_mes = self.projecao[i-1]
-                if curr_parcelas_count < len(prev_mes.detalhes_parcelas):
-                     # Highlight saldo because an installment ended
-                     styled_saldo = f"[bold green]{styled_saldo}[/]"
-
-            table.add_row(
-                mes_str,
-                str(mes.dias_uteis),
-                format_currency(mes.dsr_valor),
-                format_currency(mes.salario_liquido),
-                format_currency(mes.gastos_totais),
-                styled_saldo,
-                parcelas_str
+        # KPIs e tabela atualizados num unico refresh de tela
+        with self.batch_update():
+            # 1. Update KPIs (Mes Atual - indice 0)
+            atual = self.projecao[0]
+
+            self.query_one("#kpi-receita", KPICard).update_value(format_currency(atual.salario_liquido))
+            self.query_one("#kpi-gastos", KPICard).update_value(format_currency(atual.gastos_totais))
+            self.query_one("#kpi-meta", KPICard).update_value(format_currency(atual.meta_investimento))
+            self.query_one("#kpi-saldo", KPICard).update_value(format_currency(atual.saldo_livre))
+
+            # 2. Update Table
+            table = self.query_one(DataTable)
+            table.clear(columns=True)
+            table.add_columns(
+                "Mês",
+                "Dias Úteis",
+                "DSR",
+                "Receita Líq.",
+                "Gastos Totais",
+                "Saldo Livre",
+                "Parcelas Ativas"
             )
 
+            # Track previous installments to highlight changes
+            rows: list[tuple[str, ...]] = []
+            for i, mes in enumerate(self.projecao):
+                mes_str = f"{_MES_ABBR[mes.data.month - 1]}/{mes.data.year}"
+                curr_parcelas_count = len(mes.detalhes_parcelas)
+
+                # Formatar lista de parcelas
+                parcelas_str = ", ".join(mes.detalhes_parcelas) if mes.detalhes_parcelas else "-"
+
+                # Simple highlight logic: if parcelas count dropped, maybe highlight the row or cell?
+                # Textual DataTable supports styling rows/cells?
+                # We can use rich text or just logic.
+
+                # Let's verify if a installment ended compared to previous month
+                # (In this logic, we iterate forward. If previous month had more installments,
+                # this month represents a "relief".)
+
+                # Note: The logic in prompt says "Visual highlight when an installment ends (saldo livre increases)".
+                # A simple way is to check if saldo livre jumped significantly or parcel count dropped.
+
+                styled_saldo = format_currency(mes.saldo_livre)
+                if i > 0:
+                    prev_mes = self.projecao[i-1]
+                    if curr_parcelas_count < len(prev_mes.detalhes_parcelas):
+                         # Highlight saldo because an installment ended
+                         styled_saldo = f"[bold green]{styled_saldo}[/]"
+
+                rows.append((
+                    mes_str,
+                    str(mes.dias_uteis),
+                    format_currency(mes.dsr_valor),
+                    format_currency(mes.salario_liquido),
+                    format_currency(mes.gastos_totais),
+                    styled_saldo,
+                    parcelas_str
+                ))
+
+            table.add_rows(rows)
+
 if __name__ == "__main__":
     app = TuiFinanceira()
     app.run()
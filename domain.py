@@ -1,13 +1,22 @@
+import bisect
 import calendar
 import json
 import datetime
-from dataclasses import dataclass
+import functools
+import itertools
+import os
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import List, Tuple, Dict
+from typing import FrozenSet, List, Sequence, Tuple, Dict
 
-import holidays
+# Instancia unica compartilhada pela analise de calendario
+_CAL = calendar.Calendar()
 
-@dataclass
+def _ym(ano: int, mes: int) -> int:
+    # Mes codificado como inteiro (ano * 12 + mes - 1): comparacoes viram inteiras
+    return ano * 12 + mes - 1
+
+@dataclass(slots=True, frozen=True)
 class Configuracao:
     salario_base: Decimal
     produtividade_media: Decimal
@@ -16,40 +25,41 @@ class Configuracao:
     valor_diario_vt: Decimal
     valor_diario_va: Decimal
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GastoFixo:
     nome: str
     valor: Decimal
     categoria: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Parcelamento:
     nome: str
     valor_parcela: Decimal
     inicio: str  # YYYY-MM
     fim: str     # YYYY-MM
+    _start_ym: int = field(init=False, repr=False, compare=False)
+    _end_ym: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Parse "YYYY-MM" uma unica vez; esta_ativo vira duas comparacoes inteiras.
+        # strptime valida o formato (ValueError em mes invalido) fora do caminho quente.
+        # Classe congelada: atribuicao via object.__setattr__
+        inicio = datetime.datetime.strptime(self.inicio, "%Y-%m")
+        fim = datetime.datetime.strptime(self.fim, "%Y-%m")
+        object.__setattr__(self, "_start_ym", _ym(inicio.year, inicio.month))
+        object.__setattr__(self, "_end_ym", _ym(fim.year, fim.month))
 
     def esta_ativo(self, mes_referencia: datetime.date) -> bool:
-        start_date = datetime.datetime.strptime(self.inicio, "%Y-%m").date()
-        # Ensure start_date is the first of the month
-        start_date = start_date.replace(day=1)
-
-        end_date = datetime.datetime.strptime(self.fim, "%Y-%m").date()
-        # Ensure end_date includes the entire month (set to last day of that month for comparison,
-        # or just compare year/month)
-        # Easier: check if start_date <= mes_referencia <= end_date (comparing first of months)
-        end_date = end_date.replace(day=1)
-
-        ref = mes_referencia.replace(day=1)
-        return start_date <= ref <= end_date
+        return self._start_ym <= _ym(mes_referencia.year, mes_referencia.month) <= self._end_ym
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OrcamentoData:
+    # Imutavel: load_data devolve a mesma instancia (cacheada) a todos os chamadores
     configuracao: Configuracao
-    gastos_fixos: List[GastoFixo]
-    parcelamentos: List[Parcelamento]
+    gastos_fixos: Sequence[GastoFixo]
+    parcelamentos: Sequence[Parcelamento]
 
-@dataclass
+@dataclass(slots=True)
 class MesProjecao:
     data: datetime.date
     salario_bruto: Decimal
@@ -66,91 +76,119 @@ class MesProjecao:
     dsr_valor: Decimal
     detalhes_parcelas: List[str]
 
+# Cache de leitura: uma entrada por caminho, substituida quando (mtime_ns, tamanho) muda
+_DATA_CACHE: Dict[str, Tuple[int, int, OrcamentoData]] = {}
+
 def load_data(filepath: str = "orcamento.json") -> OrcamentoData:
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return _parse_data(filepath)
+
+    cached = _DATA_CACHE.get(filepath)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    dados = _parse_data(filepath)
+    _DATA_CACHE[filepath] = (st.st_mtime_ns, st.st_size, dados)
+    return dados
+
+def _parse_data(filepath: str) -> OrcamentoData:
+    # Numeros do JSON viram Decimal direto do texto, sem passar por float
     with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+        data = json.load(f, parse_float=Decimal, parse_int=Decimal)
 
     config = Configuracao(
-        salario_base=Decimal(str(data["configuracao"]["salario_base"])),
-        produtividade_media=Decimal(str(data["configuracao"]["produtividade_media"])),
-        meta_investimento_percentual=Decimal(str(data["configuracao"]["meta_investimento_percentual"])),
+        salario_base=data["configuracao"]["salario_base"],
+        produtividade_media=data["configuracao"]["produtividade_media"],
+        meta_investimento_percentual=data["configuracao"]["meta_investimento_percentual"],
         estado_feriados=data["configuracao"]["estado_feriados"],
-        valor_diario_vt=Decimal(str(data["configuracao"].get("valor_diario_vt", "0.00"))),
-        valor_diario_va=Decimal(str(data["configuracao"].get("valor_diario_va", "0.00")))
+        valor_diario_vt=data["configuracao"].get("valor_diario_vt", Decimal("0.00")),
+        valor_diario_va=data["configuracao"].get("valor_diario_va", Decimal("0.00"))
     )
 
-    gastos_fixos = [
+    gastos_fixos = tuple(
         GastoFixo(
             nome=g["nome"],
-            valor=Decimal(str(g["valor"])),
+            valor=g["valor"],
             categoria=g["categoria"]
         ) for g in data["gastos_fixos"]
-    ]
+    )
 
-    parcelamentos = [
+    parcelamentos = tuple(
         Parcelamento(
             nome=p["nome"],
-            valor_parcela=Decimal(str(p["valor_parcela"])),
+            valor_parcela=p["valor_parcela"],
             inicio=p["inicio"],
             fim=p["fim"]
         ) for p in data["parcelamentos"]
-    ]
+    )
 
     return OrcamentoData(config, gastos_fixos, parcelamentos)
 
-def analisar_calendario(ano: int, mes: int, estado: str) -> Tuple[int, int, int]:
-    """
-    Retorna (dias_uteis, dias_descanso, dias_uteis_beneficios).
-    Dias úteis: Segunda a Sábado (exceto feriados).
-    Dias descanso: Domingos + Feriados.
-    Dias úteis benefícios: Segunda a Sexta (exceto feriados).
-    """
-    br_holidays = holidays.country_holidays("BR", subdiv=estado, years=ano)
-    month_days = calendar.monthrange(ano, mes)[1]
+@functools.lru_cache(maxsize=16)
+def _holiday_set(estado: str, ano: int) -> FrozenSet[datetime.date]:
+    # Feriados sao imutaveis para um dado (estado, ano); o conjunto serve a todos os meses do ano.
+    # Import tardio: o pacote holidays e pesado e so e necessario ao gerar a projecao
+    import holidays
+
+    return frozenset(holidays.country_holidays("BR", subdiv=estado, years=ano).keys())
+
+@functools.lru_cache(maxsize=256)
+def _calendario_cached(ano: int, mes: int, estado: str) -> Tuple[int, int, int]:
+    is_holiday = _holiday_set(estado, ano).__contains__
 
     dias_uteis = 0
     dias_descanso = 0
     dias_uteis_beneficios = 0
 
-    for day in range(1, month_days + 1):
-        date_obj = datetime.date(ano, mes, day)
+    for d in _CAL.itermonthdates(ano, mes):
+        if d.month != mes:
+            continue
 
-        is_sunday = (date_obj.weekday() == 6)
-        is_holiday = (date_obj in br_holidays)
-        is_saturday = (date_obj.weekday() == 5)
-
-        if is_sunday or is_holiday:
+        wd = d.weekday()
+        if wd == 6 or is_holiday(d):
             dias_descanso += 1
         else:
             # Segunda (0) a Sabado (5) e nao feriado
             dias_uteis += 1
-            if not is_saturday:
+            if wd != 5:
                 dias_uteis_beneficios += 1
 
     return dias_uteis, dias_descanso, dias_uteis_beneficios
 
-def calcular_inss(bruto: Decimal) -> Decimal:
-    # Tabela Progressiva INSS 2024 (aproximada)
-    # Faixas: 1412.00 (7.5%), 2666.68 (9%), 4000.03 (12%), Teto 7786.02 (14%)
-    faixas = [
-        (Decimal("1412.00"), Decimal("0.075")),
-        (Decimal("2666.68"), Decimal("0.09")),
-        (Decimal("4000.03"), Decimal("0.12")),
-        (Decimal("7786.02"), Decimal("0.14")),
-    ]
+def analisar_calendario(ano: int, mes: int, estado: str) -> Tuple[int, int, int]:
+    """
+    Retorna (dias_uteis, dias_descanso, dias_uteis_beneficios).
+    Dias úteis: Segunda a Sábado (exceto feriados).
+    Dias descanso: Domingos + Feriados.
+    Dias úteis benefícios: Segunda a Sexta (exceto feriados).
+    """
+    return _calendario_cached(ano, mes, estado)
+
+# Tabela Progressiva INSS 2024 (aproximada)
+# Faixas: 1412.00 (7.5%), 2666.68 (9%), 4000.03 (12%), Teto 7786.02 (14%)
+_INSS_LIMITES = (Decimal("1412.00"), Decimal("2666.68"), Decimal("4000.03"), Decimal("7786.02"))
+_INSS_ALIQUOTAS = (Decimal("0.075"), Decimal("0.09"), Decimal("0.12"), Decimal("0.14"))
+_INSS_PISOS = (Decimal("0.00"),) + _INSS_LIMITES[:-1]
+# Desconto acumulado ao entrar em cada faixa; o ultimo item e o desconto no teto
+_INSS_ACUMULADO = tuple(itertools.accumulate(
+    (
+        (limite - piso) * aliquota
+        for piso, limite, aliquota in zip(_INSS_PISOS, _INSS_LIMITES, _INSS_ALIQUOTAS)
+    ),
+    initial=Decimal("0.00"),
+))
 
-    desconto = Decimal("0.00")
-    anterior = Decimal("0.00")
+def calcular_inss(bruto: Decimal) -> Decimal:
+    if bruto <= 0:
+        return Decimal("0.00")
 
-    for limite, aliquota in faixas:
-        if bruto > anterior:
-            base = min(bruto, limite) - anterior
-            desconto += base * aliquota
-            anterior = limite
-        else:
-            break
+    faixa = bisect.bisect_left(_INSS_LIMITES, bruto)
+    if faixa == len(_INSS_LIMITES):
+        return _INSS_ACUMULADO[-1]
 
-    return desconto
+    return _INSS_ACUMULADO[faixa] + (bruto - _INSS_PISOS[faixa]) * _INSS_ALIQUOTAS[faixa]
 
 def calcular_irrf(base_calculo: Decimal) -> Decimal:
     # Tabela Progressiva IRRF (Vigencia 2024 - 2 salarios minimos isencao simplificada ou tabela normal)
@@ -176,7 +214,7 @@ def calcular_holerite(config: Configuracao, dias_uteis: int, dias_descanso: int)
     if dias_uteis == 0:
         dsr = Decimal("0.00")
     else:
-        dsr = (config.produtividade_media / Decimal(dias_uteis)) * Decimal(dias_descanso)
+        dsr = (config.produtividade_media / dias_uteis) * dias_descanso
 
     bruto = config.salario_base + config.produtividade_media + dsr
 
@@ -200,41 +238,50 @@ def gerar_projecao(dados: OrcamentoData, meses: int = 12) -> List[MesProjecao]:
     projecao = []
     data_atual = datetime.date.today().replace(day=1)
 
-    for i in range(meses):
-        # Calcular mes alvo
-        mes_ano = i + data_atual.month
-        ano_offset = (mes_ano - 1) // 12
-        mes_real = ((mes_ano - 1) % 12) + 1
-        ano_real = data_atual.year + ano_offset
-
-        data_ref = datetime.date(ano_real, mes_real, 1)
-
-        # 1. Calendario
-        dias_uteis, dias_descanso, dias_uteis_beneficios = analisar_calendario(ano_real, mes_real, dados.configuracao.estado_feriados)
-
-        # 2. Holerite
-        holerite = calcular_holerite(dados.configuracao, dias_uteis, dias_descanso)
-
-        # Calcular benefícios (VA + VT)
-        total_beneficios = (dados.configuracao.valor_diario_vt + dados.configuracao.valor_diario_va) * dias_uteis_beneficios
+    # Invariantes da projecao: calculados uma vez fora do laco
+    config = dados.configuracao
+    estado = config.estado_feriados
+    meta_pct = config.meta_investimento_percentual
+    valor_diario_beneficio = config.valor_diario_vt + config.valor_diario_va
+    total_fixos = sum((g.valor for g in dados.gastos_fixos), Decimal("0.00"))
+
+    # Cronograma (ano, mes) de todos os meses projetados, montado de uma vez
+    base_ano, base_mes = data_atual.year, data_atual.month
+    cronograma = [
+        ((base_mes - 1 + i) // 12 + base_ano, (base_mes - 1 + i) % 12 + 1) for i in range(meses)
+    ]
 
-        # Adicionar benefícios à receita líquida
+    # 1. Calendario: colunas (data, mes codificado, dias) de cada mes
+    datas = [datetime.date(ano, mes, 1) for ano, mes in cronograma]
+    meses_ym = [_ym(ano, mes) for ano, mes in cronograma]
+    calendario = [analisar_calendario(ano, mes, estado) for ano, mes in cronograma]
+
+    # 2. Holerite: depende apenas de (dias_uteis, dias_descanso), entao meses
+    # com a mesma contagem compartilham o calculo
+    holerites: Dict[Tuple[int, int], Dict[str, Decimal]] = {}
+    for dias_uteis, dias_descanso, _ in calendario:
+        if (dias_uteis, dias_descanso) not in holerites:
+            holerites[dias_uteis, dias_descanso] = calcular_holerite(
+                config, dias_uteis, dias_descanso
+            )
+
+    # 3. Parcelamentos: limites ja codificados como inteiros, sem esta_ativo no laco
+    limites = [(p._start_ym, p._end_ym, p) for p in dados.parcelamentos]
+    ativos = [[p for inicio, fim, p in limites if inicio <= ym <= fim] for ym in meses_ym]
+
+    for data_ref, (dias_uteis, dias_descanso, dias_uteis_beneficios), parcelas in zip(
+        datas, calendario, ativos
+    ):
+        holerite = holerites[dias_uteis, dias_descanso]
+
+        # Adicionar benefícios (VA + VT) à receita líquida
+        total_beneficios = valor_diario_beneficio * dias_uteis_beneficios
         salario_liquido_com_beneficios = holerite["liquido"] + total_beneficios
 
-        # 3. Gastos Fixos
-        total_fixos = sum((g.valor for g in dados.gastos_fixos), start=Decimal("0.00"))
-
-        # 4. Parcelamentos
-        total_parcelas = Decimal("0.00")
-        detalhes_parcelas = []
-        for p in dados.parcelamentos:
-            if p.esta_ativo(data_ref):
-                total_parcelas += p.valor_parcela
-                detalhes_parcelas.append(p.nome)
-
+        total_parcelas = sum((p.valor_parcela for p in parcelas), Decimal("0.00"))
         gastos_totais = total_fixos + total_parcelas
         saldo_livre = salario_liquido_com_beneficios - gastos_totais
-        meta_investimento = salario_liquido_com_beneficios * dados.configuracao.meta_investimento_percentual
+        meta_investimento = salario_liquido_com_beneficios * meta_pct
 
         projecao.append(MesProjecao(
             data=data_ref,
@@ -250,7 +297,7 @@ def gerar_projecao(dados: OrcamentoData, meses: int = 12) -> List[MesProjecao]:
             dias_uteis=dias_uteis,
             dias_descanso=dias_descanso,
             dsr_valor=holerite["dsr"],
-            detalhes_parcelas=detalhes_parcelas
+            detalhes_parcelas=[p.nome for p in parcelas]
         ))
 
     return projecao
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import os
+import pathlib
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+import domain
+from app import TuiFinanceira, format_currency
+
+def test_format_currency_pt_br() -> None:
+    assert format_currency(Decimal("1234.5")) == "R$ 1.234,50"
+    assert format_currency(Decimal("0")) == "R$ 0,00"
+    assert format_currency(Decimal("1234567.891")) == "R$ 1.234.567,89"
+
+def test_format_currency_negativo_e_float() -> None:
+    assert format_currency(Decimal("-1500.5")) == "-R$ 1.500,50"
+    assert format_currency(2706.636693) == "R$ 2.706,64"
+
+def test_recarga_sem_mudanca_nao_reprojeta(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(domain, "_DATA_CACHE", {})
+    arquivo = tmp_path / "orcamento.json"
+
+    def escrever(valor_gasto: int, mtime_ns: int) -> None:
+        arquivo.write_text(json.dumps({
+            "configuracao": {
+                "salario_base": 1000.00,
+                "produtividade_media": 0.00,
+                "meta_investimento_percentual": 0.10,
+                "estado_feriados": "SP"
+            },
+            "gastos_fixos": [{"nome": "Ajuste", "valor": valor_gasto, "categoria": "Outros"}],
+            "parcelamentos": []
+        }), encoding="utf-8")
+        os.utime(arquivo, ns=(mtime_ns, mtime_ns))
+
+    # -1 e -2 tem o mesmo hash em CPython: a recarga precisa comparar os dados em si
+    escrever(-1, 1)
+    mensagens: list[str] = []
+
+    async def cenario() -> None:
+        app = TuiFinanceira()
+
+        def notify(message: str, **kwargs: Any) -> None:
+            mensagens.append(message)
+
+        monkeypatch.setattr(app, "notify", notify)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            projecao_inicial = app.projecao
+
+            await pilot.press("r")
+            await pilot.pause()
+            assert mensagens[-1] == "Sem alterações"
+            assert app.projecao is projecao_inicial
+
+            escrever(-2, 2)
+            await pilot.press("r")
+            await pilot.pause()
+            assert mensagens[-1] == "Dados recarregados com sucesso!"
+            assert app.projecao[0].gastos_fixos == Decimal("-2")
+
+    asyncio.run(cenario())
@@ -1,9 +1,13 @@
 import datetime
 import json
+import os
+import pathlib
 from decimal import Decimal
 from unittest.mock import patch, mock_open
 
+import pytest
 
+import domain
 from domain import (
     analisar_calendario,
     calcular_inss,
@@ -114,6 +118,13 @@ def test_parcelamento_esta_ativo() -> None:
     # After
     assert not p.esta_ativo(datetime.date(2024, 6, 1))
 
+def test_parcelamento_mes_invalido() -> None:
+    for mes in ("2024-13", "2024-00", "202405"):
+        with pytest.raises(ValueError):
+            Parcelamento("Test", Decimal("100"), mes, "2024-12")
+        with pytest.raises(ValueError):
+            Parcelamento("Test", Decimal("100"), "2024-01", mes)
+
 def test_calcular_holerite() -> None:
     config = Configuracao(
         salario_base=Decimal("2000.00"),
@@ -243,3 +254,67 @@ def test_gerar_projecao_com_beneficios() -> None:
     expected_liquid = Decimal("925.00") + expected_benefits
 
     assert m.salario_liquido == expected_liquid
+
+def test_gerar_projecao_parcelamento_encerra() -> None:
+    config = Configuracao(
+        salario_base=Decimal("1000.00"),
+        produtividade_media=Decimal("0.00"),
+        meta_investimento_percentual=Decimal("0.0"),
+        estado_feriados="SP",
+        valor_diario_vt=Decimal("0.00"),
+        valor_diario_va=Decimal("0.00")
+    )
+    hoje = datetime.date.today()
+    mes_atual = f"{hoje.year:04d}-{hoje.month:02d}"
+    parc = [
+        Parcelamento("Atual", Decimal("50.00"), mes_atual, mes_atual),
+        Parcelamento("Passado", Decimal("70.00"), "2000-01", "2000-12"),
+    ]
+
+    proj = gerar_projecao(OrcamentoData(config, [], parc), meses=3)
+
+    assert proj[0].detalhes_parcelas == ["Atual"]
+    assert proj[0].gastos_parcelados == Decimal("50.00")
+    assert proj[1].detalhes_parcelas == []
+    assert proj[1].gastos_parcelados == Decimal("0.00")
+
+def test_load_data_cache_por_mtime(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(domain, "_DATA_CACHE", {})
+    arquivo = tmp_path / "orcamento.json"
+
+    def escrever(salario_base: float) -> None:
+        arquivo.write_text(json.dumps({
+            "configuracao": {
+                "salario_base": salario_base,
+                "produtividade_media": 0.00,
+                "meta_investimento_percentual": 0.10,
+                "estado_feriados": "SP"
+            },
+            "gastos_fixos": [],
+            "parcelamentos": []
+        }), encoding="utf-8")
+
+    escrever(1000.00)
+    primeiro = load_data(str(arquivo))
+    assert load_data(str(arquivo)) is primeiro
+
+    escrever(2000.00)
+    os.utime(arquivo, ns=(0, 1))
+
+    recarregado = load_data(str(arquivo))
+    assert recarregado is not primeiro
+    assert recarregado.configuracao.salario_base == Decimal("2000.0")
+    assert list(domain._DATA_CACHE) == [str(arquivo)]
+    assert isinstance(recarregado.gastos_fixos, tuple)
+
+def test_parcelamento_congelado_compara_campos_declarados() -> None:
+    a = Parcelamento("P", Decimal("50.00"), "2024-01", "2024-05")
+    b = Parcelamento("P", Decimal("50.00"), "2024-01", "2024-05")
+    c = Parcelamento("P", Decimal("60.00"), "2024-01", "2024-05")
+
+    # _start_ym/_end_ym sao derivados e ficam fora da comparacao
+    assert a == b
+    assert a != c
+    assert b.esta_ativo(datetime.date(2024, 3, 1))